@@ -26,6 +26,9 @@ from telegram_bot.services.webhook_service import validate_telegram_request
 
 logger = get_logger("app")
 
+# Upper bound on startup warmup, so an unreachable service cannot hang startup
+WARMUP_TIMEOUT = 15.0  # seconds
+
 
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     """Middleware to add comprehensive security headers to all responses."""
@@ -265,8 +268,13 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     await set_webhook_with_retry(bot, settings)
 
     # Pre-warm internal service connections (tokens + HTTP connections)
-    # This eliminates cold-start latency on first user message
-    await warmup_client()
+    # This eliminates cold-start latency on first user message. Awaited rather
+    # than backgrounded: with request-based CPU allocation Cloud Run throttles
+    # work left running after startup.
+    try:
+        await asyncio.wait_for(warmup_client(), timeout=WARMUP_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("Client warmup timed out after %.0fs", WARMUP_TIMEOUT)
 
     yield
 
@@ -264,9 +264,12 @@ def create_message_router() -> Router:
         input_type = classifier.classify(message)
         processor = get_processor()
 
-        # Continuous typing indicator - refreshes every 4s while LLM processes
-        async with continuous_typing(bot, message.chat.id):
-            result = await processor.process_message(message, input_type, bot)
+        # Unhandled commands resolve without a backend call or typing indicator
+        result = processor.try_fast_path(input_type)
+        if result is None:
+            # Continuous typing indicator - refreshes every 4s while LLM processes
+            async with continuous_typing(bot, message.chat.id):
+                result = await processor.process_message(message, input_type, bot)
 
         # Try to send products as media group if available
         if result.products:
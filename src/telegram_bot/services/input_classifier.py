@@ -92,6 +92,9 @@ class InputClassifier:
 
     Attributes:
         _ATTRIBUTE_TYPE_MAP: Ordered mapping of message attributes to InputType.
+        _MEDIA_ATTRS: Attribute to InputType lookup built from the map.
+        _MEDIA_KEYS: Frozen set of the mapped attribute names.
+        _MEDIA_PRIORITY: Attribute to position in _ATTRIBUTE_TYPE_MAP.
         _MAX_LOG_CONTENT_LENGTH: Maximum characters to log from message content.
 
     Example:
@@ -127,6 +130,13 @@ class InputClassifier:
         ("dice", InputType.DICE),
     ]
 
+    # Hashed views of _ATTRIBUTE_TYPE_MAP for raw dict classification
+    _MEDIA_ATTRS: dict[str, InputType] = dict(_ATTRIBUTE_TYPE_MAP)
+    _MEDIA_KEYS: frozenset[str] = frozenset(_MEDIA_ATTRS)
+    _MEDIA_PRIORITY: dict[str, int] = {
+        attr: rank for rank, (attr, _) in enumerate(_ATTRIBUTE_TYPE_MAP)
+    }
+
     def classify(self, message: Message) -> InputType:
         """Classify the input type of a Telegram message.
 
@@ -242,10 +252,14 @@ class InputClassifier:
         Returns:
             The classified input type.
         """
-        # Check for media types in raw data
-        for attr, input_type in self._ATTRIBUTE_TYPE_MAP:
-            if attr in data and data[attr] is not None:
-                return input_type
+        # Check for media types in raw data: intersect keys instead of probing
+        # all 13 attributes, then keep map priority when several are present
+        present = [
+            attr for attr in self._MEDIA_KEYS & data.keys() if data[attr] is not None
+        ]
+        if present:
+            attr = min(present, key=self._MEDIA_PRIORITY.__getitem__)
+            return self._MEDIA_ATTRS[attr]
 
         # Check for text
         text = data.get("text")
@@ -4,8 +4,8 @@ This module provides authenticated HTTP clients for calling internal Cloud Run
 services using IAM-based authentication with connection pooling and pre-warming.
 
 Features:
-    - Persistent HTTP client with connection pooling
-    - Async token fetching (non-blocking)
+    - Persistent per-service HTTP clients with connection pooling
+    - Async token fetching (non-blocking, coalesced per audience)
     - Token caching with auto-refresh
     - Connection pre-warming at startup
     - Automatic retry on transient failures
@@ -22,13 +22,19 @@ Example:
 """
 
 import asyncio
+import concurrent.futures
 import contextlib
 import os
 import random
 import time
-from typing import Any
+import uuid
+from typing import Any, Final
 
+import google.auth.transport.requests
 import httpx
+import orjson
+from google.auth import compute_engine
+from google.oauth2 import id_token
 
 from telegram_bot.logging_config import get_logger
 
@@ -36,6 +42,8 @@ logger = get_logger("internal_client")
 
 # Token cache TTL (50 minutes, tokens valid for 1 hour)
 TOKEN_CACHE_TTL = 50 * 60
+# Refresh in the background once a cached token is this close to expiry
+TOKEN_REFRESH_AHEAD = 5 * 60
 
 # HTTP client settings for optimal performance
 HTTP_TIMEOUT = httpx.Timeout(
@@ -44,15 +52,16 @@ HTTP_TIMEOUT = httpx.Timeout(
     write=10.0,  # Write timeout
     pool=5.0,  # Pool timeout
 )
+# Applied per origin: every internal service gets its own client and pool
 HTTP_LIMITS = httpx.Limits(
-    max_keepalive_connections=10,
-    max_connections=20,
-    keepalive_expiry=300.0,  # 5 minutes
+    max_keepalive_connections=100,
+    max_connections=1000,  # Headroom for bursty fan-out; HTTP/2 multiplexes
+    keepalive_expiry=900.0,  # 15 minutes
 )
 
 # Retry configuration (based on Context7 best practices)
 # HTTPTransport handles ConnectError/ConnectTimeout
-# Manual retry handles WriteError, NetworkError, and 5xx errors
+# Manual retry handles WriteError, NetworkError, 429 and 5xx errors
 MAX_RETRIES = 3
 RETRY_BASE_DELAY = 1.0  # seconds
 RETRY_MAX_DELAY = 10.0  # seconds
@@ -66,6 +75,50 @@ RETRYABLE_EXCEPTIONS = (
     httpx.RemoteProtocolError,
 )
 
+# Statuses worth retrying: 429 (Cloud Run has no instance free while scaling
+# out) and 5xx except 501 Not Implemented, which never succeeds on retry
+_RETRYABLE_STATUSES: Final[frozenset[int]] = frozenset(
+    {429, 500, 502, 503, 504, 505, 506, 507, 508, 510, 511}
+)
+
+
+def _parse_ok(response: httpx.Response) -> dict[str, Any]:
+    """Raise on HTTP errors, otherwise decode the JSON body.
+
+    Decodes straight from the raw bytes with orjson, skipping the
+    bytes-to-str pass done by ``response.json()``.
+
+    Args:
+        response: Response returned by the internal service.
+
+    Returns:
+        Decoded JSON body.
+
+    Raises:
+        httpx.HTTPStatusError: If the response has a 4xx/5xx status.
+    """
+    if response.status_code >= 400:
+        response.raise_for_status()
+    result: dict[str, Any] = orjson.loads(response.content)
+    return result
+
+
+def _origin(url: httpx.URL | str) -> str:
+    """Return the normalized ``scheme://host[:port]`` origin of an absolute URL.
+
+    Strings are parsed like request URLs (host lowercased, default port
+    dropped), so configured and requested URLs map to the same origin.
+
+    Args:
+        url: Absolute request URL.
+
+    Returns:
+        The origin, e.g. ``https://asr.example.com``.
+    """
+    if isinstance(url, str):
+        url = httpx.URL(url)
+    return f"{url.scheme}://{url.netloc.decode('ascii')}"
+
 
 class InternalServiceClient:
     """Client for calling internal Cloud Run services with IAM authentication.
@@ -105,46 +158,133 @@ class InternalServiceClient:
             "https://mcp-server-4k3haexkga-uc.a.run.app",
         )
 
-        # Token cache: {audience: (token, expiry_time)}
+        # Endpoint URLs parsed once, so requests skip httpx's URL parsing
+        self._nlp_process_url = httpx.URL(f"{self.nlp_url}/api/v1/process")
+        self._asr_transcribe_url = httpx.URL(f"{self.asr_url}/transcribe")
+        self._ocr_analyze_url = httpx.URL(f"{self.ocr_url}/analyze/upload")
+        self._mcp_image_search_url = httpx.URL(f"{self.mcp_url}/api/v1/image-search")
+
+        # Token cache: {audience: (token, monotonic expiry)}
         self._token_cache: dict[str, tuple[str, float]] = {}
-        self._token_lock = asyncio.Lock()
+        # In-flight token fetches: {audience: task}. Concurrent callers for one
+        # audience share a fetch; different audiences fetch in parallel.
+        self._token_inflight: dict[str, asyncio.Task[str]] = {}
+        # Dedicated threads for blocking metadata-server calls, so token
+        # refreshes never queue behind other asyncio.to_thread() work.
+        # Created on first use, so a client reused after close() gets new ones.
+        self._auth_executor: concurrent.futures.ThreadPoolExecutor | None = None
+
+        # Prebuilt request headers per audience, rebuilt when the token changes:
+        # {audience: (token, auth-only headers, auth + JSON content-type headers)}
+        self._header_cache: dict[str, tuple[str, httpx.Headers, httpx.Headers]] = {}
+
+        # google-auth transport shared by all token fetches (created lazily).
+        # Its requests.Session keeps the metadata-server connection alive.
+        self._gauth_request: google.auth.transport.requests.Request | None = None
+
+        # On Cloud Run (K_SERVICE is set) ID tokens always come from the
+        # metadata server, so keep one credentials object per audience and
+        # just refresh it instead of re-running fetch_id_token's discovery.
+        self._on_cloud_run = "K_SERVICE" in os.environ
+        self._id_creds: dict[str, compute_engine.IDTokenCredentials] = {}
+
+        # Persistent HTTP clients per origin, so each service keeps its own
+        # connections and HPACK state. Built eagerly (construction does no I/O)
+        # so the request path is a plain dict lookup. ASR/OCR carry one large
+        # multipart upload per message, where HTTP/2 flow control and framing
+        # cost CPU without any multiplexing gain, so they use HTTP/1.1.
+        self._origin_http2 = self._service_origins()
+        self._http_clients = self._build_http_clients()
+
+        # Private PRNG for retry jitter (not shared with the module-level one)
+        self._rand = random.Random()
+
+    def _service_origins(self) -> dict[str, bool]:
+        """Map each configured service origin to whether it uses HTTP/2.
+
+        Unset service URLs are skipped.
+
+        Returns:
+            Mapping of origin to its HTTP/2 flag.
+        """
+        services: tuple[tuple[str | None, bool], ...] = (
+            (self.nlp_url, True),
+            (self.asr_url, False),
+            (self.ocr_url, False),
+            (self.mcp_url, True),
+        )
+        return {_origin(url): http2 for url, http2 in services if url}
 
-        # Persistent HTTP client (created lazily)
-        self._http_client: httpx.AsyncClient | None = None
-        self._client_lock = asyncio.Lock()
+    def _build_http_clients(self) -> dict[str, httpx.AsyncClient]:
+        """Create one pooled client per configured service origin.
+
+        Returns:
+            Mapping of origin to its HTTP client.
+        """
+        return {
+            origin: self._new_http_client(http2=http2)
+            for origin, http2 in self._origin_http2.items()
+        }
 
-    async def _get_http_client(self) -> httpx.AsyncClient:
-        """Get or create the persistent HTTP client.
+    @staticmethod
+    def _new_http_client(http2: bool = True) -> httpx.AsyncClient:
+        """Create a pooled HTTP client.
 
         Uses HTTPTransport with retries for connection errors (Context7 best practice).
+
+        Args:
+            http2: Negotiate HTTP/2 (otherwise HTTP/1.1 keep-alive only).
+
+        Returns:
+            A new AsyncClient with its own connection pool.
         """
-        if self._http_client is None or self._http_client.is_closed:
-            async with self._client_lock:
-                if self._http_client is None or self._http_client.is_closed:
-                    # HTTPTransport with retries handles ConnectError/ConnectTimeout
-                    transport = httpx.AsyncHTTPTransport(
-                        retries=2,  # Retry connection errors twice
-                        http2=True,  # HTTP/2 for better multiplexing
-                    )
-                    self._http_client = httpx.AsyncClient(
-                        transport=transport,
-                        timeout=HTTP_TIMEOUT,
-                        limits=HTTP_LIMITS,
-                    )
-        return self._http_client
+        # HTTPTransport with retries handles ConnectError/ConnectTimeout
+        # Pool limits must live on the transport: AsyncClient ignores
+        # `limits` when an explicit transport is supplied.
+        transport = httpx.AsyncHTTPTransport(
+            retries=3,  # Retry connection errors (e.g. cold instances) 3 times
+            http2=http2,  # HTTP/2 for better multiplexing where enabled
+            limits=HTTP_LIMITS,
+        )
+        return httpx.AsyncClient(
+            transport=transport,
+            timeout=HTTP_TIMEOUT,
+            follow_redirects=False,  # Internal APIs never redirect
+        )
+
+    def _get_http_client(self, url: httpx.URL | str) -> httpx.AsyncClient:
+        """Get the persistent HTTP client for the origin of ``url``.
+
+        Clients for the configured services exist from ``__init__``; one is
+        created on demand only for an unknown origin or after ``close()``,
+        keeping the HTTP version configured for that origin.
+
+        Args:
+            url: Absolute URL of the request (only its origin is used).
+
+        Returns:
+            The pooled client dedicated to that origin.
+        """
+        origin = _origin(url)
+        client = self._http_clients.get(origin)
+        if client is None:
+            client = self._http_clients[origin] = self._new_http_client(
+                http2=self._origin_http2.get(origin, True)
+            )
+        return client
 
     async def _request_with_retry(
         self,
         method: str,
-        url: str,
-        headers: dict[str, str],
+        url: httpx.URL | str,
+        headers: httpx.Headers,
         max_retries: int = MAX_RETRIES,
         **kwargs: Any,
     ) -> httpx.Response:
         """Execute HTTP request with retry logic for transient errors.
 
         Implements exponential backoff with jitter for WriteError, NetworkError,
-        and 5xx server errors (Context7 best practice for resilient HTTP clients).
+        429 and 5xx server errors (Context7 best practice for resilient HTTP clients).
 
         Args:
             method: HTTP method (GET, POST, etc.)
@@ -160,23 +300,21 @@ class InternalServiceClient:
             httpx.HTTPStatusError: If request fails after all retries
             httpx.RequestError: If network error persists after all retries
         """
-        client = await self._get_http_client()
+        client = self._get_http_client(url)
         last_exception: Exception | None = None
 
         for attempt in range(max_retries + 1):
             try:
                 response = await client.request(method, url, headers=headers, **kwargs)
 
-                # Retry on 5xx server errors (except 501 Not Implemented)
-                is_retryable_5xx = (
-                    response.status_code >= 500
-                    and response.status_code != 501
-                    and attempt < max_retries
-                )
-                if is_retryable_5xx:
+                # Retry on 429 and 5xx server errors (except 501 Not Implemented)
+                if (
+                    attempt < max_retries
+                    and response.status_code in _RETRYABLE_STATUSES
+                ):
                     delay = self._calculate_retry_delay(attempt)
                     logger.warning(
-                        "Server error %d, retrying in %.1fs (attempt %d/%d)",
+                        "Retryable status %d, retrying in %.1fs (attempt %d/%d)",
                         response.status_code,
                         delay,
                         attempt + 1,
@@ -187,21 +325,31 @@ class InternalServiceClient:
 
                 return response
 
+            except httpx.PoolTimeout:
+                # Every connection to this origin stayed busy for the whole
+                # pool timeout: a saturation signal, not a transient error
+                logger.warning(
+                    "Connection pool exhausted for %s (max_connections=%s)",
+                    _origin(url),
+                    HTTP_LIMITS.max_connections,
+                )
+                raise
+
             except RETRYABLE_EXCEPTIONS as e:
                 last_exception = e
                 if attempt < max_retries:
                     delay = self._calculate_retry_delay(attempt)
                     logger.warning(
-                        "%s error, retrying in %.1fs (attempt %d/%d): %s",
+                        "%s error, retrying in %.1fs (attempt %d/%d): %.100s",
                         type(e).__name__,
                         delay,
                         attempt + 1,
                         max_retries,
-                        str(e)[:100],
+                        e,
                     )
+                    # The pool drops the broken connection on its own; resetting
+                    # the whole client would kill every other in-flight request.
                     await asyncio.sleep(delay)
-                    # Reset HTTP client on network errors to get fresh connection
-                    await self._reset_http_client()
                 else:
                     logger.error(
                         "%s error after %d retries: %s",
@@ -228,29 +376,40 @@ class InternalServiceClient:
         # Exponential backoff: base * 2^attempt
         delay: float = RETRY_BASE_DELAY * (2**attempt)
         # Add random jitter
-        jitter: float = delay * RETRY_JITTER * random.random()
+        jitter: float = delay * RETRY_JITTER * self._rand.random()
         delay = delay + jitter
         # Cap at max delay
         return float(min(delay, RETRY_MAX_DELAY))
 
     async def _reset_http_client(self) -> None:
-        """Reset HTTP client to get fresh connections after network errors."""
-        async with self._client_lock:
-            if self._http_client is not None:
-                with contextlib.suppress(Exception):
-                    await self._http_client.aclose()
-                self._http_client = None
+        """Close the HTTP clients and their connection pools (shutdown path only)."""
+        # Detach first so nothing picks up a client while it is closing
+        clients, self._http_clients = self._http_clients, {}
+        for client in clients.values():
+            with contextlib.suppress(Exception):
+                await client.aclose()
 
     def _fetch_token_sync(self, audience: str) -> str:
         """Synchronously fetch identity token (runs in thread pool).
 
         Uses the GCP metadata server in Cloud Run, or ADC locally.
         """
-        import google.auth.transport.requests
-        from google.oauth2 import id_token
-
-        request = google.auth.transport.requests.Request()
-        token = id_token.fetch_id_token(request, audience)
+        request = self._gauth_request
+        if request is None:
+            request = self._gauth_request = google.auth.transport.requests.Request()
+
+        if self._on_cloud_run:
+            creds = self._id_creds.get(audience)
+            if creds is None:
+                creds = self._id_creds[audience] = compute_engine.IDTokenCredentials(  # type: ignore[no-untyped-call]
+                    request,
+                    target_audience=audience,
+                    use_metadata_identity_endpoint=True,
+                )
+            creds.refresh(request)  # type: ignore[no-untyped-call]
+            token = creds.token
+        else:
+            token = id_token.fetch_id_token(request, audience)
         if token is None:
             raise ValueError(f"Failed to obtain identity token for {audience}")
         return str(token)
@@ -264,29 +423,109 @@ class InternalServiceClient:
         Returns:
             Identity token string
         """
-        # Check cache first (without lock for performance)
-        if audience in self._token_cache:
-            token, expiry = self._token_cache[audience]
-            if time.time() < expiry:
-                return token
-
-        # Fetch new token with lock to prevent thundering herd
-        async with self._token_lock:
-            # Double-check after acquiring lock
-            if audience in self._token_cache:
-                token, expiry = self._token_cache[audience]
-                if time.time() < expiry:
-                    return token
-
-            logger.info("Fetching new identity token for %s", audience)
-            start = time.perf_counter()
-            token = await asyncio.to_thread(self._fetch_token_sync, audience)
-            elapsed = (time.perf_counter() - start) * 1000
-            logger.info("Token fetched in %.0fms", elapsed)
-
-            # Cache the token
-            self._token_cache[audience] = (token, time.time() + TOKEN_CACHE_TTL)
-            return token
+        # Lock-free fast path: entries are replaced as whole (token, expiry)
+        # tuples, so a single read never sees a torn value.
+        now = time.monotonic()
+        cached = self._token_cache.get(audience)
+        if cached is not None and cached[1] > now:
+            if (
+                cached[1] - now < TOKEN_REFRESH_AHEAD
+                and audience not in self._token_inflight
+            ):
+                # Near expiry: serve the still-valid token, refresh behind it
+                self._start_token_refresh(audience)
+            return cached[0]
+
+        # Join the in-flight fetch for this audience, or start one. No await
+        # between the lookup and the insert, so this cannot race on one loop.
+        task = self._token_inflight.get(audience)
+        if task is None:
+            task = self._start_token_refresh(audience)
+        # Shield so one cancelled caller does not abort the shared fetch
+        return await asyncio.shield(task)
+
+    def _start_token_refresh(self, audience: str) -> asyncio.Task[str]:
+        """Start a token fetch for ``audience`` and register it as in-flight.
+
+        Args:
+            audience: The URL of the target service
+
+        Returns:
+            The fetch task, removed from the in-flight map once done
+        """
+        task = asyncio.create_task(self._refresh_token(audience))
+        self._token_inflight[audience] = task
+        task.add_done_callback(lambda t: self._on_token_refresh_done(audience, t))
+        return task
+
+    def _on_token_refresh_done(self, audience: str, task: asyncio.Task[str]) -> None:
+        """Drop a finished fetch from the in-flight map and log failures.
+
+        Args:
+            audience: The URL of the target service
+            task: The completed fetch task
+        """
+        self._token_inflight.pop(audience, None)
+        # Retrieving the exception also keeps unawaited background refreshes
+        # from logging "exception was never retrieved"
+        if not task.cancelled() and (exc := task.exception()) is not None:
+            logger.warning("Identity token refresh for %s failed: %s", audience, exc)
+
+    async def _get_auth_headers(
+        self, audience: str, *, json_body: bool = False
+    ) -> httpx.Headers:
+        """Get cached request headers carrying a valid identity token.
+
+        The headers are built once per token rather than on every call.
+        Callers must copy them before adding per-request entries.
+
+        Args:
+            audience: The URL of the target service
+            json_body: Include ``Content-Type: application/json``
+
+        Returns:
+            Headers with Authorization (and Content-Type when requested)
+        """
+        token = await self._get_identity_token(audience)
+        cached = self._header_cache.get(audience)
+        if cached is None or cached[0] != token:
+            auth = {"Authorization": f"Bearer {token}"}
+            cached = self._header_cache[audience] = (
+                token,
+                httpx.Headers(auth),
+                httpx.Headers({**auth, "Content-Type": "application/json"}),
+            )
+        return cached[2] if json_body else cached[1]
+
+    async def _refresh_token(self, audience: str) -> str:
+        """Fetch a fresh identity token and store it in the cache.
+
+        Args:
+            audience: The URL of the target service
+
+        Returns:
+            Identity token string
+        """
+        logger.info("Fetching new identity token for %s", audience)
+        start = time.perf_counter()
+        executor = self._auth_executor
+        if executor is None:
+            # One thread per configured service, so a cold start fetches every
+            # audience's token at once instead of in serial rounds
+            audiences = {self.nlp_url, self.asr_url, self.ocr_url, self.mcp_url}
+            executor = self._auth_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max(len(audiences - {None, ""}), 1),
+                thread_name_prefix="id-token",
+            )
+        token = await asyncio.get_running_loop().run_in_executor(
+            executor, self._fetch_token_sync, audience
+        )
+        elapsed = (time.perf_counter() - start) * 1000
+        logger.info("Token fetched in %.0fms", elapsed)
+
+        # Cache the token
+        self._token_cache[audience] = (token, time.monotonic() + TOKEN_CACHE_TTL)
+        return token
 
     async def warmup(self) -> None:
         """Pre-warm tokens and connections for all services.
@@ -296,31 +535,39 @@ class InternalServiceClient:
         logger.info("Warming up internal service client...")
         start = time.perf_counter()
 
-        # Pre-fetch tokens for all services in parallel
         services = [
-            ("nlp", self.nlp_url),
-            ("asr", self.asr_url),
-            ("ocr", self.ocr_url),
-            ("mcp", self.mcp_url),
+            (name, url)
+            for name, url in (
+                ("nlp", self.nlp_url),
+                ("asr", self.asr_url),
+                ("ocr", self.ocr_url),
+                ("mcp", self.mcp_url),
+            )
+            if url
         ]
 
-        async def warmup_service(name: str, url: str) -> None:
-            if not url:
-                return
-            try:
-                # Get token
-                token = await self._get_identity_token(url)
-
-                # Warm up connection with health check
-                client = await self._get_http_client()
-                headers = {"Authorization": f"Bearer {token}"}
+        # Phase 1: fetch all tokens in parallel before any health check, so
+        # metadata-server latency is paid once rather than per service.
+        tokens = await asyncio.gather(
+            *[self._get_identity_token(url) for _, url in services],
+            return_exceptions=True,
+        )
 
+        async def warmup_service(name: str, url: str, token: str) -> None:
+            try:
                 # Use /health endpoint if available, otherwise just connect
                 health_url = f"{url}/health"
                 if "nlp" in name:
                     health_url = f"{url}/api/v1/health"
 
-                response = await client.get(health_url, headers=headers)
+                # Only the TCP/TLS (and HTTP/2 preface) setup matters here, so
+                # any status counts: send a HEAD and drop the response unread.
+                client = self._get_http_client(url)
+                request = client.build_request(
+                    "HEAD", health_url, headers={"Authorization": f"Bearer {token}"}
+                )
+                response = await client.send(request, stream=True)
+                await response.aclose()
                 logger.info(
                     "Warmed up %s: status=%d",
                     name,
@@ -329,7 +576,14 @@ class InternalServiceClient:
             except Exception as e:
                 logger.warning("Failed to warmup %s: %s", name, e)
 
-        await asyncio.gather(*[warmup_service(n, u) for n, u in services])
+        # Phase 2: open each service's connection
+        health_checks = []
+        for (name, url), token in zip(services, tokens, strict=True):
+            if isinstance(token, BaseException):
+                logger.warning("Failed to warmup %s: %s", name, token)
+                continue
+            health_checks.append(warmup_service(name, url, token))
+        await asyncio.gather(*health_checks)
 
         elapsed = (time.perf_counter() - start) * 1000
         logger.info("Client warmup completed in %.0fms", elapsed)
@@ -363,11 +617,7 @@ class InternalServiceClient:
         Raises:
             httpx.HTTPStatusError: If the request fails
         """
-        token = await self._get_identity_token(self.nlp_url)
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-        }
+        headers = await self._get_auth_headers(self.nlp_url, json_body=True)
         payload: dict[str, Any] = {"text": text}
         if conversation_id:
             payload["conversation_id"] = conversation_id
@@ -387,12 +637,11 @@ class InternalServiceClient:
 
         response = await self._request_with_retry(
             "POST",
-            f"{self.nlp_url}/api/v1/process",
+            self._nlp_process_url,
             headers=headers,
-            json=payload,
+            content=orjson.dumps(payload),
         )
-        response.raise_for_status()
-        result: dict[str, Any] = response.json()
+        result = _parse_ok(response)
 
         elapsed = (time.perf_counter() - start) * 1000
         logger.info(
@@ -406,12 +655,14 @@ class InternalServiceClient:
         self,
         audio_content: bytes,
         filename: str,
+        mime_type: str = "audio/ogg",
     ) -> dict[str, Any]:
         """Call the ASR service to transcribe audio.
 
         Args:
             audio_content: Binary content of the audio file
             filename: Name of the audio file
+            mime_type: MIME type of the audio (voice notes are OGG/Opus)
 
         Returns:
             Transcription response with text and metadata
@@ -419,13 +670,8 @@ class InternalServiceClient:
         Raises:
             httpx.HTTPStatusError: If the request fails
         """
-        import uuid
-
-        token = await self._get_identity_token(self.asr_url)
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "X-Request-Id": str(uuid.uuid4()),
-        }
+        headers = (await self._get_auth_headers(self.asr_url)).copy()
+        headers["X-Request-Id"] = str(uuid.uuid4())
 
         form_data = {
             "client_id": "telegram-bot",
@@ -436,17 +682,15 @@ class InternalServiceClient:
 
         response = await self._request_with_retry(
             "POST",
-            f"{self.asr_url}/transcribe",
+            self._asr_transcribe_url,
             headers=headers,
-            files={"audio_file": (filename, audio_content, "audio/ogg")},
+            files={"audio_file": (filename, audio_content, mime_type)},
             data=form_data,
         )
-        response.raise_for_status()
-        result: dict[str, Any] = response.json()
+        result = _parse_ok(response)
         transcription = result.get("data", {}).get("transcription", "")
-        logger.info(
-            "ASR service transcribed: %s", transcription[:50] if transcription else ""
-        )
+        # %.50s truncates only when the record is actually formatted
+        logger.info("ASR service transcribed: %.50s", transcription or "")
         return result
 
     async def call_analyze_service(
@@ -478,20 +722,18 @@ class InternalServiceClient:
         Raises:
             httpx.HTTPStatusError: If the request fails
         """
-        token = await self._get_identity_token(self.ocr_url)
-        headers = {"Authorization": f"Bearer {token}"}
+        headers = await self._get_auth_headers(self.ocr_url)
 
         logger.info("Calling analyze service with file: %s", filename)
 
         response = await self._request_with_retry(
             "POST",
-            f"{self.ocr_url}/analyze/upload",
+            self._ocr_analyze_url,
             headers=headers,
             files={"file": (filename, file_content, mime_type)},
             data={"client_id": client_id, "mode": "auto"},
         )
-        response.raise_for_status()
-        result: dict[str, Any] = response.json()
+        result = _parse_ok(response)
 
         # Log classification result
         classification = result.get("classification", {})
@@ -543,11 +785,7 @@ class InternalServiceClient:
         Raises:
             httpx.HTTPStatusError: If the request fails.
         """
-        token = await self._get_identity_token(self.mcp_url)
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-        }
+        headers = await self._get_auth_headers(self.mcp_url, json_body=True)
 
         payload = {
             "embedding": embedding,
@@ -564,12 +802,13 @@ class InternalServiceClient:
 
         response = await self._request_with_retry(
             "POST",
-            f"{self.mcp_url}/api/v1/image-search",
+            self._mcp_image_search_url,
             headers=headers,
-            json=payload,
+            # orjson encodes the 1536-float vector in C, far faster than the
+            # stdlib json encoder httpx uses for `json=`
+            content=orjson.dumps(payload),
         )
-        response.raise_for_status()
-        result: dict[str, Any] = response.json()
+        result = _parse_ok(response)
 
         elapsed = (time.perf_counter() - start) * 1000
         found = result.get("found", False)
@@ -583,22 +822,45 @@ class InternalServiceClient:
 
         return result
 
+    def _reset_after_fork(self) -> None:
+        """Drop all inherited state in a forked child process.
+
+        Pooled sockets, executor threads, in-flight tasks and the parent's event
+        loop do not survive a fork, so the child starts from a clean slate
+        instead of sharing TLS sessions with its parent. Nothing is closed:
+        closing would touch the parent's connections.
+        """
+        self._http_clients = self._build_http_clients()
+        self._token_cache.clear()
+        self._header_cache.clear()
+        self._token_inflight.clear()
+        self._id_creds.clear()
+        self._gauth_request = None
+        self._auth_executor = None
+
     async def close(self) -> None:
-        """Close the HTTP client and clean up resources."""
-        if self._http_client is not None:
-            await self._http_client.aclose()
-            self._http_client = None
+        """Close the HTTP clients and clean up resources.
+
+        The client stays usable: a later request reopens what it needs.
+        """
+        await self._reset_http_client()
+        executor, self._auth_executor = self._auth_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
 
+# Singleton instance for reuse. Construction has no side effects (no I/O, no
+# event loop needed) until warmup() or the first request, so build it eagerly.
+_client: Final[InternalServiceClient] = InternalServiceClient()
 
-# Singleton instance for reuse
-_client: InternalServiceClient | None = None
+# Pre-forking servers (gunicorn --preload) import this module in the parent;
+# give every worker its own pools, tokens and threads.
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_client._reset_after_fork)
 
 
 def get_client() -> InternalServiceClient:
     """Get the singleton internal service client instance."""
-    global _client
-    if _client is None:
-        _client = InternalServiceClient()
     return _client
 
 
@@ -13,12 +13,20 @@ Example:
     result = await processor.process_text("Hello, how are you?")
 """
 
-from dataclasses import dataclass
+import asyncio
+import io
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, replace
 from enum import Enum
-from typing import Any
+from functools import lru_cache
+from typing import Any, cast
 
+import httpx
+import orjson
 from aiogram import Bot
-from aiogram.types import Message
+from aiogram.types import File, Message
 
 from telegram_bot.logging_config import get_logger
 from telegram_bot.services.input_classifier import InputType
@@ -32,6 +40,20 @@ logger = get_logger("message_processor")
 # Products below this threshold trigger text-based search instead
 EXACT_MATCH_THRESHOLD = 0.80
 
+# Analyze classifications that never depict a catalog product; their
+# embeddings are not searched ('mixed' images still contain an object)
+_NON_PRODUCT_TYPES = frozenset({"document"})
+
+# Longest side of the photo variant sent for analysis. OCR and object
+# detection accuracy saturate well below Telegram's largest size, so larger
+# variants only add download and upload bytes.
+MAX_PHOTO_DIMENSION = 1600
+
+# Telegram getFile results by file_id. Download paths stay valid for at least
+# an hour, so forwarded or re-sent media skips the getFile round trip.
+FILE_CACHE_MAX_SIZE = 256
+FILE_CACHE_TTL = 600.0  # seconds
+
 
 def _extract_error_code(error: Exception) -> str | None:
     """Extract error_code from an HTTP error response.
@@ -42,11 +64,9 @@ def _extract_error_code(error: Exception) -> str | None:
     Returns:
         Error code string if found, None otherwise.
     """
-    import httpx
-
     if isinstance(error, httpx.HTTPStatusError):
         try:
-            response_data: dict[str, Any] = error.response.json()
+            response_data: dict[str, Any] = orjson.loads(error.response.content)
             error_code: str | None = response_data.get("error_code")
             return error_code
         except Exception:
@@ -76,7 +96,7 @@ class ProcessingStatus(str, Enum):
     NO_CONTENT = "no_content"
 
 
-@dataclass
+@dataclass(slots=True)
 class Product:
     """Product data for display.
 
@@ -101,7 +121,7 @@ class Product:
     match_type: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ProcessingResult:
     """Result of message processing.
 
@@ -122,6 +142,45 @@ class ProcessingResult:
     products: list[Product] | None = None
 
 
+def _error_result(
+    key: str,
+    input_type: InputType,
+    lang: str | None,
+    *,
+    status: ProcessingStatus = ProcessingStatus.ERROR,
+    error: str | None = None,
+    raw_response: dict[str, Any] | None = None,
+) -> ProcessingResult:
+    """Build a result whose reply is a localized status message.
+
+    Args:
+        key: Message key (e.g., 'asr_failed', 'download_failed')
+        input_type: Type of input that was processed
+        lang: User's language code for the message
+        status: Processing status (defaults to ERROR)
+        error: Error message if processing failed
+        raw_response: Raw response from the backend service
+
+    Returns:
+        ProcessingResult carrying the localized message
+    """
+    return ProcessingResult(
+        status=status,
+        response=_get_message(key, lang),
+        input_type=input_type,
+        raw_response=raw_response,
+        error=error,
+    )
+
+
+# Shared result for unhandled commands (results are immutable)
+_COMMAND_RESULT = ProcessingResult(
+    status=ProcessingStatus.SUCCESS,
+    response="",
+    input_type=InputType.COMMAND,
+)
+
+
 def _extract_user_info(message: Message) -> dict[str, Any] | None:
     """Extract user information from a Telegram message for tracking.
 
@@ -158,6 +217,23 @@ class MessageProcessor:
     def __init__(self) -> None:
         """Initialize the message processor."""
         self._client = get_client()
+        # Pending NLP calls by request key, shared by identical concurrent
+        # requests. Only touched between awaits on the event loop, so it needs
+        # no lock.
+        self._nlp_inflight: dict[
+            tuple[str | None, Any, str | None, str], asyncio.Task[dict[str, Any]]
+        ] = {}
+        # LRU of getFile results: {file_id: (expiry, file)}
+        self._file_cache: OrderedDict[str, tuple[float, File]] = OrderedDict()
+        # Input type -> handler, built once so routing is a single dict lookup
+        self._dispatch: dict[
+            InputType, Callable[[Message, Bot], Awaitable[ProcessingResult]]
+        ] = {
+            InputType.TEXT: self._process_text_message,
+            InputType.VOICE: self._process_audio_message,
+            InputType.AUDIO: self._process_audio_message,
+            InputType.PHOTO: self._process_photo_message,
+        }
 
     async def process_message(
         self,
@@ -184,60 +260,150 @@ class MessageProcessor:
             message.chat.id,
         )
 
-        match input_type:
-            case InputType.TEXT:
-                return await self._process_text_message(message)
-            case InputType.VOICE | InputType.AUDIO:
-                return await self._process_audio_message(message, bot)
-            case InputType.PHOTO:
-                return await self._process_photo_message(message, bot)
-            case InputType.COMMAND:
-                # Commands are handled by command handlers, not here
-                return ProcessingResult(
-                    status=ProcessingStatus.SUCCESS,
-                    response="",
-                    input_type=input_type,
-                )
-            case _:
-                lang = message.from_user.language_code if message.from_user else None
-                return ProcessingResult(
-                    status=ProcessingStatus.UNSUPPORTED,
-                    response=_get_message("unsupported", lang),
-                    input_type=input_type,
-                )
+        handler = self._dispatch.get(input_type)
+        if handler is not None:
+            return await handler(message, bot)
+
+        fast_result = self.try_fast_path(input_type)
+        if fast_result is not None:
+            return fast_result
+
+        lang = message.from_user.language_code if message.from_user else None
+        return _error_result(
+            "unsupported", input_type, lang, status=ProcessingStatus.UNSUPPORTED
+        )
+
+    def try_fast_path(self, input_type: InputType) -> ProcessingResult | None:
+        """Return the result for inputs that need no backend call, if any.
+
+        Lets handlers skip the typing indicator and the process_message
+        coroutine for trivial inputs.
+
+        Args:
+            input_type: The classified type of the message
+
+        Returns:
+            A ready ProcessingResult, or None if the message must be processed
+        """
+        if input_type is InputType.COMMAND:
+            # Commands are handled by command handlers, not here
+            return _COMMAND_RESULT
+        return None
 
-    async def _process_text_message(self, message: Message) -> ProcessingResult:
+    async def _process_text_message(
+        self,
+        message: Message,
+        bot: Bot,  # noqa: ARG002
+    ) -> ProcessingResult:
         """Process a text message via NLP service.
 
         Args:
             message: The text message to process
+            bot: The Bot instance (unused; text needs no downloads)
 
         Returns:
             ProcessingResult with NLP response
         """
-        text = message.text
-        lang = message.from_user.language_code if message.from_user else None
+        # Whitespace-only messages have nothing for the NLP service to answer
+        text = message.text.strip() if message.text else ""
+        user_info = _extract_user_info(message)
+        # Telegram's language_code is a fallback hint and picks the language
+        # of error messages; Gemini itself replies in the input's language
+        lang = user_info["language_code"] if user_info else None
         if not text:
-            return ProcessingResult(
-                status=ProcessingStatus.NO_CONTENT,
-                response=_get_message("empty_text", lang),
-                input_type=InputType.TEXT,
+            return _error_result(
+                "empty_text", InputType.TEXT, lang, status=ProcessingStatus.NO_CONTENT
             )
 
         # Use chat_id as conversation_id for context continuity
-        conversation_id = str(message.chat.id)
-        # Extract user info for tracking
-        user_info = _extract_user_info(message)
-        # Use Telegram's language_code as fallback for error messages only
-        # Gemini automatically detects and responds in the user's input language
-        user_language = user_info.get("language_code") if user_info else None
         return await self.process_text(
             text,
-            conversation_id=conversation_id,
+            conversation_id=str(message.chat.id),
             user_info=user_info,
-            detected_language=user_language,
+            detected_language=lang,
         )
 
+    async def _get_file_cached(self, bot: Bot, file_id: str) -> File:
+        """Resolve a Telegram file through the getFile cache.
+
+        Args:
+            bot: The Bot instance for the getFile call
+            file_id: Telegram file identifier
+
+        Returns:
+            The File with its download path
+        """
+        cached = self._file_cache.get(file_id)
+        if cached is not None and cached[0] > time.monotonic():
+            self._file_cache.move_to_end(file_id)
+            return cached[1]
+
+        file = await bot.get_file(file_id)
+        # Only files with a download path are worth remembering
+        if file.file_path:
+            self._file_cache[file_id] = (time.monotonic() + FILE_CACHE_TTL, file)
+            self._file_cache.move_to_end(file_id)
+            if len(self._file_cache) > FILE_CACHE_MAX_SIZE:
+                self._file_cache.popitem(last=False)
+        return file
+
+    async def _call_nlp_shared(
+        self,
+        text: str,
+        conversation_id: str | None,
+        user_info: dict[str, Any] | None,
+        detected_language: str | None,
+    ) -> dict[str, Any]:
+        """Call the NLP service, sharing the call among in-flight duplicates.
+
+        Identical requests from the same sender arriving while one is pending
+        (a double send) share that single call. Replies are not cached beyond
+        it: the NLP service is conversational, so a later repeat must reach it
+        to be answered in its current context and recorded as a turn.
+        Command-like text ('/...') bypasses the sharing, since its reply
+        depends on state.
+
+        Args:
+            text: The text to process
+            conversation_id: Optional conversation ID for context continuity
+            user_info: Optional user information for tracking
+            detected_language: Optional language hint for the NLP service
+
+        Returns:
+            Raw NLP service response
+        """
+        if text.startswith("/"):
+            return await self._client.call_nlp_service(
+                text,
+                conversation_id=conversation_id,
+                user_info=user_info,
+                detected_language=detected_language,
+            )
+
+        # Exact text: any normalization would merge prompts the service may
+        # answer differently. The sender is part of the key so two users of a
+        # group chat never share one reply or lose a turn.
+        sender = user_info.get("external_id") if user_info else None
+        key = (conversation_id, sender, detected_language, text)
+        task = self._nlp_inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._client.call_nlp_service(
+                    text,
+                    conversation_id=conversation_id,
+                    user_info=user_info,
+                    detected_language=detected_language,
+                )
+            )
+            self._nlp_inflight[key] = task
+            task.add_done_callback(lambda _: self._nlp_inflight.pop(key, None))
+        else:
+            logger.info(
+                "Joining in-flight NLP call for conversation_id=%s", conversation_id
+            )
+        # Shield so one cancelled caller does not abort the shared call
+        return await asyncio.shield(task)
+
     async def process_text(
         self,
         text: str,
@@ -260,7 +426,7 @@ class MessageProcessor:
             but NOT appended to response to avoid duplication with Gemini's format.
         """
         try:
-            result = await self._client.call_nlp_service(
+            result = await self._call_nlp_shared(
                 text,
                 conversation_id=conversation_id,
                 user_info=user_info,
@@ -305,12 +471,7 @@ class MessageProcessor:
         except Exception as e:
             logger.exception("NLP service error: %s", e)
             lang = user_info.get("language_code") if user_info else None
-            return ProcessingResult(
-                status=ProcessingStatus.ERROR,
-                response=_get_message("nlp_failed", lang),
-                input_type=InputType.TEXT,
-                error=str(e),
-            )
+            return _error_result("nlp_failed", InputType.TEXT, lang, error=str(e))
 
     async def _process_audio_message(
         self,
@@ -326,57 +487,55 @@ class MessageProcessor:
         Returns:
             ProcessingResult with transcribed and processed response
         """
-        # Get the file (voice or audio)
+        # Get the file (voice or audio). Voice notes are always OGG/Opus; audio
+        # files are sent with their own name and type so ASR decodes them
+        # natively instead of sniffing a mislabelled upload.
         file_id = None
+        filename = "voice.ogg"
+        mime_type = "audio/ogg"
         if message.voice:
             file_id = message.voice.file_id
         elif message.audio:
             file_id = message.audio.file_id
+            filename = message.audio.file_name or "audio.mp3"
+            mime_type = message.audio.mime_type or "audio/mpeg"
 
-        lang = message.from_user.language_code if message.from_user else None
+        client = self._client
+        user_info = _extract_user_info(message)
+        lang = user_info["language_code"] if user_info else None
         if not file_id:
-            return ProcessingResult(
-                status=ProcessingStatus.NO_CONTENT,
-                response=_get_message("empty_audio", lang),
-                input_type=InputType.VOICE,
+            return _error_result(
+                "empty_audio", InputType.VOICE, lang, status=ProcessingStatus.NO_CONTENT
             )
 
         try:
             # Download the audio file
-            file = await bot.get_file(file_id)
+            file = await self._get_file_cached(bot, file_id)
             if not file.file_path:
-                return ProcessingResult(
-                    status=ProcessingStatus.ERROR,
-                    response=_get_message("download_failed", lang),
-                    input_type=InputType.VOICE,
-                )
+                return _error_result("download_failed", InputType.VOICE, lang)
 
             file_bytes = await bot.download_file(file.file_path)
             if not file_bytes:
-                return ProcessingResult(
-                    status=ProcessingStatus.ERROR,
-                    response=_get_message("download_failed", lang),
-                    input_type=InputType.VOICE,
-                )
+                return _error_result("download_failed", InputType.VOICE, lang)
 
-            audio_content = file_bytes.read()
+            # download_file returns the BytesIO it filled; getvalue() hands
+            # over its buffer, where read() would copy it once more
+            audio_content = cast(io.BytesIO, file_bytes).getvalue()
 
             # Transcribe via ASR (Chirp 2 with auto language detection)
             try:
-                asr_result = await self._client.call_asr_service(
+                asr_result = await client.call_asr_service(
                     audio_content=audio_content,
-                    filename="voice.ogg",
+                    filename=filename,
+                    mime_type=mime_type,
                 )
             except Exception as asr_error:
                 # Check if it's a low confidence error from ASR service
                 error_code = _extract_error_code(asr_error)
                 if error_code == "LOW_CONFIDENCE":
                     logger.warning("ASR low confidence error: %s", asr_error)
-                    return ProcessingResult(
-                        status=ProcessingStatus.ERROR,
-                        response=_get_message("low_confidence", lang),
-                        input_type=InputType.VOICE,
-                        error=str(asr_error),
+                    return _error_result(
+                        "low_confidence", InputType.VOICE, lang, error=str(asr_error)
                     )
                 raise
 
@@ -384,44 +543,34 @@ class MessageProcessor:
             if not asr_result.get("success", True):
                 error_code = asr_result.get("error_code", "")
                 if error_code == "LOW_CONFIDENCE":
-                    return ProcessingResult(
-                        status=ProcessingStatus.ERROR,
-                        response=_get_message("low_confidence", lang),
-                        input_type=InputType.VOICE,
-                        raw_response=asr_result,
+                    return _error_result(
+                        "low_confidence", InputType.VOICE, lang, raw_response=asr_result
                     )
-                return ProcessingResult(
-                    status=ProcessingStatus.ERROR,
-                    response=_get_message("asr_failed", lang),
-                    input_type=InputType.VOICE,
-                    raw_response=asr_result,
+                return _error_result(
+                    "asr_failed", InputType.VOICE, lang, raw_response=asr_result
                 )
 
-            transcribed_text = asr_result.get("data", {}).get("transcription", "")
+            asr_data = asr_result.get("data") or {}
+            transcribed_text = asr_data.get("transcription", "")
             if not transcribed_text:
-                return ProcessingResult(
-                    status=ProcessingStatus.ERROR,
-                    response=_get_message("asr_failed", lang),
-                    input_type=InputType.VOICE,
-                )
+                return _error_result("asr_failed", InputType.VOICE, lang)
 
             # Log transcription with detected language
-            detected_lang = asr_result.get("data", {}).get("language", "unknown")
-            confidence = asr_result.get("data", {}).get("confidence", 0)
+            detected_lang = asr_data.get("language", "unknown")
+            confidence = asr_data.get("confidence", 0)
+            # %.100s truncates only when the record is actually formatted
             logger.info(
-                "Audio transcribed: %s (lang=%s, conf=%.2f)",
-                transcribed_text[:100],
+                "Audio transcribed: %.100s (lang=%s, conf=%.2f)",
+                transcribed_text,
                 detected_lang,
                 confidence,
             )
 
             # Process transcribed text via NLP with conversation context
             # Pass detected language from ASR with priority over Telegram language_code
-            conversation_id = str(message.chat.id)
-            user_info = _extract_user_info(message)
-            nlp_result = await self._client.call_nlp_service(
+            nlp_result = await client.call_nlp_service(
                 transcribed_text,
-                conversation_id=conversation_id,
+                conversation_id=str(message.chat.id),
                 user_info=user_info,
                 detected_language=detected_lang if detected_lang != "unknown" else None,
             )
@@ -443,18 +592,10 @@ class MessageProcessor:
             # Check for low confidence in exception message
             error_code = _extract_error_code(e)
             if error_code == "LOW_CONFIDENCE":
-                return ProcessingResult(
-                    status=ProcessingStatus.ERROR,
-                    response=_get_message("low_confidence", lang),
-                    input_type=InputType.VOICE,
-                    error=str(e),
+                return _error_result(
+                    "low_confidence", InputType.VOICE, lang, error=str(e)
                 )
-            return ProcessingResult(
-                status=ProcessingStatus.ERROR,
-                response=_get_message("asr_failed", lang),
-                input_type=InputType.VOICE,
-                error=str(e),
-            )
+            return _error_result("asr_failed", InputType.VOICE, lang, error=str(e))
 
     async def _process_photo_message(
         self,
@@ -470,43 +611,44 @@ class MessageProcessor:
         Returns:
             ProcessingResult with OCR extracted text and NLP response
         """
-        lang = message.from_user.language_code if message.from_user else None
+        # Client and user context are read once and shared by every stage below
+        client = self._client
+        user_info = _extract_user_info(message)
+        lang = user_info["language_code"] if user_info else None
+        conversation_id = str(message.chat.id)
+        # Analyze service client_id in required format user_id:chat_id
+        user_id = user_info["external_id"] if user_info else "unknown"
+        client_id = f"{user_id}:{conversation_id}"
         if not message.photo:
-            return ProcessingResult(
-                status=ProcessingStatus.NO_CONTENT,
-                response=_get_message("ocr_failed", lang),
-                input_type=InputType.PHOTO,
+            return _error_result(
+                "ocr_failed", InputType.PHOTO, lang, status=ProcessingStatus.NO_CONTENT
             )
 
         try:
-            # Get the largest photo (last in the list)
-            photo = message.photo[-1]
-            file = await bot.get_file(photo.file_id)
+            # Get the largest variant within MAX_PHOTO_DIMENSION (sizes are
+            # ordered smallest to largest); fall back to the smallest one
+            photo = next(
+                (
+                    p
+                    for p in reversed(message.photo)
+                    if max(p.width, p.height) <= MAX_PHOTO_DIMENSION
+                ),
+                message.photo[0],
+            )
+            logger.info("Selected photo variant %dx%d", photo.width, photo.height)
+            file = await self._get_file_cached(bot, photo.file_id)
 
             if not file.file_path:
-                return ProcessingResult(
-                    status=ProcessingStatus.ERROR,
-                    response=_get_message("download_failed", lang),
-                    input_type=InputType.PHOTO,
-                )
+                return _error_result("download_failed", InputType.PHOTO, lang)
 
             file_bytes = await bot.download_file(file.file_path)
             if not file_bytes:
-                return ProcessingResult(
-                    status=ProcessingStatus.ERROR,
-                    response=_get_message("download_failed", lang),
-                    input_type=InputType.PHOTO,
-                )
+                return _error_result("download_failed", InputType.PHOTO, lang)
 
-            image_content = file_bytes.read()
-
-            # Build client_id in required format user_id:chat_id
-            user_id = str(message.from_user.id) if message.from_user else "unknown"
-            chat_id = str(message.chat.id)
-            client_id = f"{user_id}:{chat_id}"
+            image_content = cast(io.BytesIO, file_bytes).getvalue()
 
             # Analyze image (auto-classifies and routes to OCR or Detection)
-            analyze_result = await self._client.call_analyze_service(
+            analyze_result = await client.call_analyze_service(
                 file_content=image_content,
                 filename="photo.jpg",
                 mime_type="image/jpeg",
@@ -521,25 +663,21 @@ class MessageProcessor:
             image_embedding = analyze_result.get("image_embedding")
 
             logger.info(
-                "Image analyzed: type=%s, confidence=%.2f, result=%s, has_embedding=%s",
+                "Image analyzed: type=%s, confidence=%.2f, result=%.100s, has_embedding=%s",
                 predicted_type,
                 confidence,
-                result_text[:100] if result_text else "empty",
+                result_text or "empty",
                 image_embedding is not None,
             )
 
-            # Build context for conversation
-            conversation_id = str(message.chat.id)
-            user_info = _extract_user_info(message)
-
             # =========================================================================
             # PRIORITY 1: Document with significant text -> OCR + NLP
             # =========================================================================
             if predicted_type == "document" and result_text:
                 logger.info("Priority 1: Processing as document with OCR text")
-                nlp_prompt = templates.render_document_prompt(result_text)
+                nlp_prompt = templates.render_document_prompt(result_text, lang)
 
-                nlp_result = await self._client.call_nlp_service(
+                nlp_result = await client.call_nlp_service(
                     nlp_prompt,
                     conversation_id=conversation_id,
                     user_info=user_info,
@@ -565,10 +703,10 @@ class MessageProcessor:
             # =========================================================================
             similar_products: list[Product] | None = None
 
-            if image_embedding:
+            if image_embedding and predicted_type not in _NON_PRODUCT_TYPES:
                 logger.info("Priority 2: Searching products by image similarity")
                 try:
-                    search_result = await self._client.search_products_by_embedding(
+                    search_result = await client.search_products_by_embedding(
                         embedding=image_embedding,
                         limit=5,
                         max_distance=0.5,  # Broader search to find similar products
@@ -583,39 +721,35 @@ class MessageProcessor:
                             best_similarity,
                         )
 
-                        # Build product list
-                        # Get user language for localized fallback
-                        user_lang = (
-                            user_info.get("language_code") if user_info else None
-                        )
+                        # Build product list with a localized fallback name
                         fallback_name = templates.get_product_message(
-                            "product_fallback", user_lang
+                            "product_fallback", lang
                         )
-                        product_list: list[Product] = []
-                        for p in found_products:
-                            if p.get("image_url"):
-                                is_exact = (
-                                    p.get("similarity", 0) >= EXACT_MATCH_THRESHOLD
-                                )
-                                product_list.append(
-                                    Product(
-                                        sku=p.get("sku", "N/A"),
-                                        name=p.get("name", fallback_name),
-                                        brand=p.get("brand"),
-                                        description=p.get("description"),
-                                        price=p.get("price"),
-                                        image_url=p.get("image_url"),
-                                        similarity=p.get("similarity", 0),
-                                        match_type="exact" if is_exact else "similar",
-                                    )
-                                )
+                        product_list = [
+                            Product(
+                                sku=p.get("sku", "N/A"),
+                                name=p.get("name", fallback_name),
+                                brand=p.get("brand"),
+                                description=p.get("description"),
+                                price=p.get("price"),
+                                image_url=image_url,
+                                similarity=(similarity := p.get("similarity", 0)),
+                                match_type=(
+                                    "exact"
+                                    if similarity >= EXACT_MATCH_THRESHOLD
+                                    else "similar"
+                                ),
+                            )
+                            for p in found_products
+                            if (image_url := p.get("image_url"))
+                        ]
 
                         # Exact match: return immediately
                         if best_similarity >= EXACT_MATCH_THRESHOLD:
                             product_name = found_products[0].get("name", fallback_name)
                             intro_response = templates.get_product_message(
                                 "exact_match_intro",
-                                user_lang,
+                                lang,
                                 product_name=product_name,
                             )
 
@@ -652,22 +786,26 @@ class MessageProcessor:
                 logger.info(
                     "Priority 3: Processing object name as user text: %s", result_text
                 )
-                # Extract user's language to ensure NLP responds in correct language
-                user_language = user_info.get("language_code") if user_info else None
+                # Pass user's language to ensure NLP responds in correct language
                 text_result = await self.process_text(
                     text=result_text,
                     conversation_id=conversation_id,
                     user_info=user_info,
-                    detected_language=user_language,
+                    detected_language=lang,
                 )
                 # Add products if we found similar ones
                 if similar_products:
-                    text_result.products = similar_products
-                    text_result.raw_response = {
-                        **(text_result.raw_response or {}),
-                        "priority": "text_with_similar_products",
-                        "similar_count": len(similar_products),
-                    }
+                    return replace(
+                        text_result,
+                        products=similar_products,
+                        # Nest rather than merge: the NLP dict may be shared with
+                        # a coalesced caller and must be neither copied nor mutated
+                        raw_response={
+                            "nlp": text_result.raw_response,
+                            "priority": "text_with_similar_products",
+                            "similar_count": len(similar_products),
+                        },
+                    )
                 return text_result
 
             # No content extracted from image
@@ -680,21 +818,14 @@ class MessageProcessor:
 
         except Exception as e:
             logger.exception("Photo processing error: %s", e)
-            return ProcessingResult(
-                status=ProcessingStatus.ERROR,
-                response=_get_message("ocr_failed", lang),
-                input_type=InputType.PHOTO,
-                error=str(e),
-            )
-
-
-# Singleton instance
-_processor: MessageProcessor | None = None
+            return _error_result("ocr_failed", InputType.PHOTO, lang, error=str(e))
 
 
+@lru_cache
 def get_processor() -> MessageProcessor:
-    """Get the singleton message processor instance."""
-    global _processor
-    if _processor is None:
-        _processor = MessageProcessor()
-    return _processor
+    """Get the singleton message processor instance.
+
+    Cached like get_settings, so steady-state calls are a cache hit with no
+    global check.
+    """
+    return MessageProcessor()
@@ -16,6 +16,7 @@ Example:
     msg = templates.render_command("start")
 """
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Final
 
@@ -296,9 +297,81 @@ Utilisez /help pour voir les commandes disponibles.""",
     },
 }
 
+# NLP prompts wrapping OCR text from document photos, by language. Plain
+# str.format templates: the OCR text is substituted once, with no template
+# engine in the per-photo path.
+DOCUMENT_PROMPTS: Final[dict[str, str]] = {
+    "en": '''The user has sent an image and I have extracted the following text from it:
+
+"""
+{extracted_text}
+"""
+
+Please help the user by interpreting this text.
+If it is a document, summarize its content.
+If it is data or a list, organize it.
+If it is a message or note, respond appropriately.
+If the text does not make sense or is incomplete, indicate what you were able to identify.''',
+    "es": '''El usuario ha enviado una imagen y he extraído el siguiente texto de ella:
+
+"""
+{extracted_text}
+"""
+
+Por favor, ayuda al usuario interpretando este texto.
+Si es un documento, resume su contenido.
+Si son datos o una lista, organízalos.
+Si es un mensaje o una nota, responde apropiadamente.
+Si el texto no tiene sentido o está incompleto, indica lo que pudiste identificar.''',
+    "pt": '''O usuário enviou uma imagem e eu extraí o seguinte texto dela:
+
+"""
+{extracted_text}
+"""
+
+Por favor, ajude o usuário interpretando este texto.
+Se for um documento, resuma seu conteúdo.
+Se forem dados ou uma lista, organize-os.
+Se for uma mensagem ou nota, responda adequadamente.
+Se o texto não fizer sentido ou estiver incompleto, indique o que você conseguiu identificar.''',
+    "fr": '''L'utilisateur a envoyé une image et j'en ai extrait le texte suivant :
+
+"""
+{extracted_text}
+"""
+
+Aide l'utilisateur en interprétant ce texte.
+S'il s'agit d'un document, résume son contenu.
+S'il s'agit de données ou d'une liste, organise-les.
+S'il s'agit d'un message ou d'une note, réponds de manière appropriée.
+Si le texte n'a pas de sens ou est incomplet, indique ce que tu as pu identifier.''',
+    "ar": '''أرسل المستخدم صورة واستخرجت منها النص التالي:
+
+"""
+{extracted_text}
+"""
+
+يرجى مساعدة المستخدم في تفسير هذا النص.
+إذا كان مستندًا، فلخّص محتواه.
+إذا كان بيانات أو قائمة، فنظّمها.
+إذا كان رسالة أو ملاحظة، فاستجب بشكل مناسب.
+إذا كان النص غير مفهوم أو غير مكتمل، فوضّح ما تمكنت من تحديده.''',
+}
+
 # Template directory relative to this module
 TEMPLATES_DIR = Path(__file__).parent
 
+# Languages with translated messages; anything else falls back to the default
+SUPPORTED_LANGUAGES: Final[frozenset[str]] = frozenset({"es", "en", "pt", "fr", "ar"})
+DEFAULT_LANGUAGE: Final[str] = "en"
+
+# Error messages keyed by (language, key) so a lookup is a single dict probe
+_FLAT_ERROR_MESSAGES: Final[dict[tuple[str, str], str]] = {
+    (lang, key): message
+    for lang, messages in ERROR_MESSAGES.items()
+    for key, message in messages.items()
+}
+
 
 def _escape_html(text: str | None) -> str:
     """Escape HTML special characters for Telegram's HTML parse mode.
@@ -344,6 +417,31 @@ def _format_percent(value: float) -> str:
     return f"{value:.0%}"
 
 
+@lru_cache(maxsize=256)
+def _normalize_language_code(language_code: str | None) -> str:
+    """Map a Telegram language code to a supported language.
+
+    Telegram sends a small set of distinct codes, so results are memoized and
+    the split/lower work runs once per code rather than once per message.
+
+    Args:
+        language_code: User's language code (e.g., 'en', 'es', 'en-US').
+
+    Returns:
+        Normalized language code from SUPPORTED_LANGUAGES.
+    """
+    if not language_code:
+        return DEFAULT_LANGUAGE
+    # Bare supported codes ('es', 'en') are the common case
+    if language_code in SUPPORTED_LANGUAGES:
+        return language_code
+    # Extract base language (e.g., 'en-US' -> 'en')
+    base_lang = language_code.split("-", 1)[0].lower()
+    if base_lang in SUPPORTED_LANGUAGES:
+        return base_lang
+    return DEFAULT_LANGUAGE
+
+
 def _truncate(text: str | None, length: int = 100) -> str:
     """Truncate text to specified length with ellipsis.
 
@@ -372,8 +470,8 @@ class TemplateManager:
     """
 
     # Supported languages for error messages
-    SUPPORTED_LANGUAGES = {"es", "en", "pt", "fr", "ar"}
-    DEFAULT_LANGUAGE = "en"
+    SUPPORTED_LANGUAGES = SUPPORTED_LANGUAGES
+    DEFAULT_LANGUAGE = DEFAULT_LANGUAGE
 
     def __init__(self) -> None:
         """Initialize the template manager with Jinja2 environment."""
@@ -382,6 +480,8 @@ class TemplateManager:
             autoescape=select_autoescape(["html", "xml"]),
             trim_blocks=True,
             lstrip_blocks=True,
+            # Templates ship with the image, so skip the per-render mtime check
+            auto_reload=False,
         )
 
         # Register custom filters
@@ -401,13 +501,7 @@ class TemplateManager:
         Returns:
             Normalized language code from supported set.
         """
-        if not language_code:
-            return self.DEFAULT_LANGUAGE
-        # Extract base language (e.g., 'en-US' -> 'en')
-        base_lang = language_code.split("-")[0].lower()
-        if base_lang in self.SUPPORTED_LANGUAGES:
-            return base_lang
-        return self.DEFAULT_LANGUAGE
+        return _normalize_language_code(language_code)
 
     def render(self, template_name: str, **context: Any) -> str:
         """Render a template with the given context.
@@ -435,9 +529,8 @@ class TemplateManager:
         Returns:
             Localized error message.
         """
-        lang = self._normalize_language(language_code)
-        messages = ERROR_MESSAGES.get(lang, ERROR_MESSAGES[self.DEFAULT_LANGUAGE])
-        return messages.get(key, DEFAULT_ERROR)
+        lang = _normalize_language_code(language_code)
+        return _FLAT_ERROR_MESSAGES.get((lang, key), DEFAULT_ERROR)
 
     def render_command(self, command: str, language_code: str | None = None) -> str:
         """Get localized command response.
@@ -548,19 +641,20 @@ class TemplateManager:
             return message.format(**kwargs)
         return message
 
-    def render_document_prompt(self, extracted_text: str) -> str:
+    def render_document_prompt(
+        self, extracted_text: str, language_code: str | None = None
+    ) -> str:
         """Render the NLP prompt for document analysis.
 
         Args:
             extracted_text: Text extracted from OCR.
+            language_code: User's language code for the prompt wrapper.
 
         Returns:
             Formatted prompt for NLP service.
         """
-        return self.render(
-            "prompts/document_analysis.j2",
-            extracted_text=extracted_text,
-        )
+        lang = _normalize_language_code(language_code)
+        return DOCUMENT_PROMPTS[lang].format(extracted_text=extracted_text)
 
     def format_nlp_products(
         self,
@@ -640,4 +734,5 @@ __all__ = [
     "DEFAULT_ERROR",
     "PRODUCT_MESSAGES",
     "COMMAND_MESSAGES",
+    "DOCUMENT_PROMPTS",
 ]
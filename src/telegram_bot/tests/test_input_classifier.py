@@ -225,6 +225,17 @@ class TestInputClassifierRaw:
         result = classifier.classify_raw(data)
         assert result == InputType.LOCATION
 
+    def test_classify_raw_priority(self, classifier: InputClassifier) -> None:
+        """Test raw classification keeps attribute priority on multiple media."""
+        data: dict[str, Any] = {
+            "location": {"latitude": 0, "longitude": 0},
+            "document": {"file_id": "123"},
+            "photo": None,
+            "text": "Hello",
+        }
+        result = classifier.classify_raw(data)
+        assert result == InputType.DOCUMENT
+
     def test_classify_raw_unknown(self, classifier: InputClassifier) -> None:
         """Test raw classification of empty message."""
         data: dict[str, Any] = {}
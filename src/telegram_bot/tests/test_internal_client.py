@@ -1,13 +1,27 @@
 """Tests for the internal service client."""
 
+import asyncio
+import time
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
+import orjson
 import pytest
 
 from telegram_bot.services.internal_client import InternalServiceClient, get_client
 
+NLP_URL = "https://nlp.example.com"
+
+
+def _json_response(data: dict[str, Any], status_code: int = 200) -> httpx.Response:
+    """Build a real httpx response carrying a JSON body."""
+    return httpx.Response(
+        status_code,
+        json=data,
+        request=httpx.Request("POST", "https://internal.example.com"),
+    )
+
 
 @pytest.fixture
 def mock_nlp_response() -> dict[str, Any]:
@@ -118,9 +132,7 @@ class TestInternalServiceClient:
         """Test successful NLP service call."""
         client = InternalServiceClient()
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = mock_nlp_response
-        mock_response.raise_for_status = MagicMock()
+        mock_response = _json_response(mock_nlp_response)
 
         with (
             patch.object(client, "_get_identity_token", return_value="test_token"),
@@ -141,9 +153,7 @@ class TestInternalServiceClient:
         """Test NLP service call with detected_language from ASR."""
         client = InternalServiceClient()
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = mock_nlp_response
-        mock_response.raise_for_status = MagicMock()
+        mock_response = _json_response(mock_nlp_response)
 
         with (
             patch.object(client, "_get_identity_token", return_value="test_token"),
@@ -161,7 +171,7 @@ class TestInternalServiceClient:
 
             # Verify detected_language was included in payload
             call_args = mock_request.call_args
-            payload = call_args.kwargs.get("json", {})
+            payload = orjson.loads(call_args.kwargs["content"])
             assert payload.get("detected_language") == "en"
             assert payload.get("text") == "Hello world"
             assert payload.get("conversation_id") == "12345"
@@ -173,12 +183,7 @@ class TestInternalServiceClient:
         """Test NLP service call with HTTP error."""
         client = InternalServiceClient()
 
-        mock_response = MagicMock()
-        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
-            "Server error",
-            request=MagicMock(),
-            response=MagicMock(status_code=500),
-        )
+        mock_response = _json_response({"detail": "Server error"}, status_code=500)
 
         with (
             patch.object(client, "_get_identity_token", return_value="test_token"),
@@ -199,9 +204,7 @@ class TestInternalServiceClient:
         """Test successful ASR service call."""
         client = InternalServiceClient()
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = mock_asr_response
-        mock_response.raise_for_status = MagicMock()
+        mock_response = _json_response(mock_asr_response)
 
         with (
             patch.object(client, "_get_identity_token", return_value="test_token"),
@@ -225,9 +228,7 @@ class TestInternalServiceClient:
         """Test successful analyze service call."""
         client = InternalServiceClient()
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = mock_analyze_response
-        mock_response.raise_for_status = MagicMock()
+        mock_response = _json_response(mock_analyze_response)
 
         with (
             patch.object(client, "_get_identity_token", return_value="test_token"),
@@ -253,9 +254,7 @@ class TestInternalServiceClient:
         """Test successful image similarity search."""
         client = InternalServiceClient()
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = mock_image_search_response
-        mock_response.raise_for_status = MagicMock()
+        mock_response = _json_response(mock_image_search_response)
 
         with (
             patch.object(client, "_get_identity_token", return_value="test_token"),
@@ -284,13 +283,13 @@ class TestInternalServiceClient:
         """Test image search when no products are found."""
         client = InternalServiceClient()
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "found": False,
-            "count": 0,
-            "products": [],
-        }
-        mock_response.raise_for_status = MagicMock()
+        mock_response = _json_response(
+            {
+                "found": False,
+                "count": 0,
+                "products": [],
+            }
+        )
 
         with (
             patch.object(client, "_get_identity_token", return_value="test_token"),
@@ -330,17 +329,188 @@ class TestInternalServiceClient:
             with pytest.raises(httpx.HTTPStatusError):
                 await client.search_products_by_embedding(embedding=mock_embedding)
 
+    @pytest.mark.asyncio
+    async def test_get_http_client_per_origin(self) -> None:
+        """Test HTTP clients are shared per origin and separate across services."""
+        client = InternalServiceClient(
+            nlp_service_url="https://nlp.example.com",
+            asr_service_url="https://asr.example.com",
+        )
+
+        nlp_client = client._get_http_client("https://nlp.example.com/api/v1/process")
+        asr_client = client._get_http_client("https://asr.example.com/transcribe")
+
+        assert client._get_http_client("https://nlp.example.com/health") is nlp_client
+        assert asr_client is not nlp_client
+
+        await client.close()
+        assert nlp_client.is_closed
+        assert asr_client.is_closed
+
+    def test_configured_origin_matches_request_urls(self) -> None:
+        """Test a URL with a default port or uppercase host keeps its client."""
+        client = InternalServiceClient(asr_service_url="https://ASR.example.com:443")
+        configured = client._http_clients["https://asr.example.com"]
+
+        assert client._get_http_client(client._asr_transcribe_url) is configured
+        assert client._origin_http2["https://asr.example.com"] is False
+
+    @pytest.mark.asyncio
+    async def test_client_reusable_after_close(self) -> None:
+        """Test use after close() reopens clients with their HTTP versions."""
+        client = InternalServiceClient(
+            nlp_service_url=NLP_URL,
+            asr_service_url="https://asr.example.com",
+        )
+        await client.close()
+
+        with patch.object(
+            client, "_new_http_client", wraps=client._new_http_client
+        ) as mock_new:
+            client._get_http_client("https://asr.example.com/transcribe")
+            client._get_http_client("https://nlp.example.com/api/v1/process")
+
+        assert [c.kwargs["http2"] for c in mock_new.call_args_list] == [False, True]
+
+        with patch.object(client, "_fetch_token_sync", return_value="test_token"):
+            assert await client._get_identity_token(NLP_URL) == "test_token"
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_token_executor_sized_to_services(self) -> None:
+        """Test every service's token can be fetched at once on a cold start."""
+        client = InternalServiceClient(nlp_service_url=NLP_URL)
+
+        with patch.object(client, "_fetch_token_sync", return_value="test_token"):
+            await client._get_identity_token(NLP_URL)
+
+        assert client._auth_executor is not None
+        assert client._auth_executor._max_workers == 4
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_get_identity_token_coalesces_concurrent_fetches(self) -> None:
+        """Test concurrent callers for one audience share a single fetch."""
+        client = InternalServiceClient(nlp_service_url=NLP_URL)
+
+        with patch.object(
+            client, "_fetch_token_sync", return_value="test_token"
+        ) as mock_fetch:
+            tokens = await asyncio.gather(
+                *[client._get_identity_token(NLP_URL) for _ in range(5)]
+            )
+            cached = await client._get_identity_token(NLP_URL)
+
+        assert tokens == ["test_token"] * 5
+        assert cached == "test_token"
+        mock_fetch.assert_called_once_with(NLP_URL)
+        assert client._token_inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_get_identity_token_refreshes_ahead_of_expiry(self) -> None:
+        """Test a near-expiry token is served while refreshing in background."""
+        client = InternalServiceClient(nlp_service_url=NLP_URL)
+        client._token_cache[NLP_URL] = ("old_token", time.monotonic() + 60)
+
+        with patch.object(client, "_fetch_token_sync", return_value="new_token"):
+            token = await client._get_identity_token(NLP_URL)
+            assert token == "old_token"
+            await client._token_inflight[NLP_URL]
+
+        assert client._token_cache[NLP_URL][0] == "new_token"
+
+    @pytest.mark.asyncio
+    async def test_get_auth_headers_cached_per_token(self) -> None:
+        """Test auth headers are reused until the token changes."""
+        client = InternalServiceClient(nlp_service_url=NLP_URL)
+
+        with patch.object(
+            client, "_get_identity_token", return_value="test_token"
+        ) as mock_token:
+            first = await client._get_auth_headers(NLP_URL, json_body=True)
+            second = await client._get_auth_headers(NLP_URL, json_body=True)
+            mock_token.return_value = "new_token"
+            third = await client._get_auth_headers(NLP_URL, json_body=True)
+
+        assert first is second
+        assert first["Authorization"] == "Bearer test_token"
+        assert first["Content-Type"] == "application/json"
+        assert third["Authorization"] == "Bearer new_token"
+
+    @pytest.mark.asyncio
+    async def test_request_with_retry_retries_too_many_requests(self) -> None:
+        """Test a 429 from a scaling service is retried."""
+        client = InternalServiceClient(nlp_service_url=NLP_URL)
+        http_client = MagicMock()
+        http_client.request = AsyncMock(
+            side_effect=[_json_response({}, status_code=429), _json_response({})]
+        )
+
+        with (
+            patch.object(client, "_get_http_client", return_value=http_client),
+            patch("asyncio.sleep", new_callable=AsyncMock),
+        ):
+            response = await client._request_with_retry(
+                "POST", NLP_URL, headers=httpx.Headers()
+            )
+
+        assert response.status_code == 200
+        assert http_client.request.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_request_with_retry_logs_pool_exhaustion(self) -> None:
+        """Test pool timeouts are logged and raised without retrying."""
+        client = InternalServiceClient(nlp_service_url=NLP_URL)
+        http_client = MagicMock()
+        http_client.request = AsyncMock(side_effect=httpx.PoolTimeout("pool full"))
+
+        with (
+            patch.object(client, "_get_http_client", return_value=http_client),
+            patch("telegram_bot.services.internal_client.logger") as mock_logger,
+            pytest.raises(httpx.PoolTimeout),
+        ):
+            await client._request_with_retry("POST", NLP_URL, headers=httpx.Headers())
+
+        assert http_client.request.await_count == 1
+        mock_logger.warning.assert_called_once()
+
+    def test_reset_after_fork_drops_inherited_state(self) -> None:
+        """Test a forked child gets fresh clients and an empty token cache."""
+        client = InternalServiceClient(nlp_service_url=NLP_URL)
+        parent_clients = dict(client._http_clients)
+        client._token_cache[NLP_URL] = ("test_token", time.monotonic() + 60)
+
+        client._reset_after_fork()
+
+        assert client._token_cache == {}
+        assert client._http_clients.keys() == parent_clients.keys()
+        for origin, parent_client in parent_clients.items():
+            assert client._http_clients[origin] is not parent_client
+
+    def test_fetch_token_sync_reuses_credentials_on_cloud_run(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test Cloud Run token refreshes reuse one credentials object."""
+        monkeypatch.setenv("K_SERVICE", "telegram-bot")
+        client = InternalServiceClient(nlp_service_url=NLP_URL)
+
+        with patch(
+            "telegram_bot.services.internal_client.compute_engine.IDTokenCredentials"
+        ) as mock_creds_cls:
+            mock_creds_cls.return_value.token = "test_token"
+            first = client._fetch_token_sync(NLP_URL)
+            second = client._fetch_token_sync(NLP_URL)
+
+        assert first == second == "test_token"
+        mock_creds_cls.assert_called_once()
+        assert mock_creds_cls.return_value.refresh.call_count == 2
+
 
 class TestGetClient:
     """Tests for get_client singleton function."""
 
     def test_get_client_singleton(self) -> None:
         """Test that get_client returns the same instance."""
-        # Reset singleton for test
-        import telegram_bot.services.internal_client as module
-
-        module._client = None
-
         client1 = get_client()
         client2 = get_client()
 
@@ -348,10 +518,6 @@ class TestGetClient:
 
     def test_get_client_returns_instance(self) -> None:
         """Test that get_client returns an InternalServiceClient."""
-        import telegram_bot.services.internal_client as module
-
-        module._client = None
-
         client = get_client()
 
         assert isinstance(client, InternalServiceClient)
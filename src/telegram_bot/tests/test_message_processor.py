@@ -1,5 +1,7 @@
 """Tests for the message processor service."""
 
+import asyncio
+import dataclasses
 import io
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -257,6 +259,18 @@ class TestProcessingResult:
         assert result.products is not None
         assert len(result.products) == 1
         assert result.products[0].name == "Keyboard"
+        assert not hasattr(result.products[0], "__dict__")
+
+    def test_result_is_immutable(self) -> None:
+        """Test results are frozen and carry no per-instance __dict__."""
+        result = ProcessingResult(
+            status=ProcessingStatus.SUCCESS,
+            response="Test response",
+            input_type=InputType.TEXT,
+        )
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.response = "changed"  # type: ignore[misc]
+        assert not hasattr(result, "__dict__")
 
 
 class TestMessageProcessor:
@@ -340,6 +354,25 @@ class TestMessageProcessor:
         assert result.status == ProcessingStatus.NO_CONTENT
         assert "text" in result.response.lower()
 
+    @pytest.mark.asyncio
+    async def test_process_text_whitespace_skips_nlp(
+        self,
+        mock_bot: MagicMock,
+    ) -> None:
+        """Test whitespace-only text is rejected without an NLP call."""
+        message = MagicMock()
+        message.chat.id = 123456789
+        message.text = "  \n\t "
+
+        processor = MessageProcessor()
+        with patch.object(
+            processor._client, "call_nlp_service", new_callable=AsyncMock
+        ) as mock_nlp:
+            result = await processor.process_message(message, InputType.TEXT, mock_bot)
+
+        assert result.status == ProcessingStatus.NO_CONTENT
+        mock_nlp.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_process_text_nlp_error(
         self,
@@ -396,6 +429,79 @@ class TestMessageProcessor:
         assert result.raw_response is not None
         assert "transcribed_text" in result.raw_response
 
+    @pytest.mark.asyncio
+    async def test_process_voice_reuses_cached_file(
+        self,
+        mock_voice_message: MagicMock,
+        mock_bot: MagicMock,
+        mock_asr_response: dict[str, Any],
+        mock_nlp_response: dict[str, Any],
+    ) -> None:
+        """Test the same file_id is resolved with getFile only once."""
+        processor = MessageProcessor()
+
+        with (
+            patch.object(
+                processor._client,
+                "call_asr_service",
+                new_callable=AsyncMock,
+                return_value=mock_asr_response,
+            ),
+            patch.object(
+                processor._client,
+                "call_nlp_service",
+                new_callable=AsyncMock,
+                return_value=mock_nlp_response,
+            ),
+        ):
+            for _ in range(2):
+                mock_bot.download_file.return_value = io.BytesIO(b"fake audio")
+                result = await processor.process_message(
+                    mock_voice_message, InputType.VOICE, mock_bot
+                )
+                assert result.status == ProcessingStatus.SUCCESS
+
+        mock_bot.get_file.assert_awaited_once_with("voice_file_123")
+
+    @pytest.mark.asyncio
+    async def test_process_audio_file_keeps_its_format(
+        self,
+        mock_voice_message: MagicMock,
+        mock_bot: MagicMock,
+        mock_asr_response: dict[str, Any],
+        mock_nlp_response: dict[str, Any],
+    ) -> None:
+        """Test audio files are uploaded with their own name and MIME type."""
+        processor = MessageProcessor()
+        mock_voice_message.voice = None
+        mock_voice_message.audio = MagicMock(
+            file_id="audio_file_123", file_name="song.mp3", mime_type="audio/mpeg"
+        )
+
+        with (
+            patch.object(
+                processor._client,
+                "call_asr_service",
+                new_callable=AsyncMock,
+                return_value=mock_asr_response,
+            ) as mock_asr_call,
+            patch.object(
+                processor._client,
+                "call_nlp_service",
+                new_callable=AsyncMock,
+                return_value=mock_nlp_response,
+            ),
+        ):
+            result = await processor.process_message(
+                mock_voice_message, InputType.AUDIO, mock_bot
+            )
+
+            call_kwargs = mock_asr_call.call_args.kwargs
+            assert call_kwargs["filename"] == "song.mp3"
+            assert call_kwargs["mime_type"] == "audio/mpeg"
+
+        assert result.status == ProcessingStatus.SUCCESS
+
     @pytest.mark.asyncio
     async def test_process_voice_passes_detected_language(
         self,
@@ -506,6 +612,39 @@ class TestMessageProcessor:
         assert result.status == ProcessingStatus.ERROR
         assert "audio" in result.response.lower()
 
+    @pytest.mark.asyncio
+    async def test_process_zero_second_voice_reaches_asr(
+        self,
+        mock_voice_message: MagicMock,
+        mock_bot: MagicMock,
+        mock_asr_response: dict[str, Any],
+        mock_nlp_response: dict[str, Any],
+    ) -> None:
+        """Test short notes reported as 0 s (whole seconds) are still transcribed."""
+        processor = MessageProcessor()
+        mock_voice_message.voice.duration = 0
+
+        with (
+            patch.object(
+                processor._client,
+                "call_asr_service",
+                new_callable=AsyncMock,
+                return_value=mock_asr_response,
+            ) as mock_asr_call,
+            patch.object(
+                processor._client,
+                "call_nlp_service",
+                new_callable=AsyncMock,
+                return_value=mock_nlp_response,
+            ),
+        ):
+            result = await processor.process_message(
+                mock_voice_message, InputType.VOICE, mock_bot
+            )
+
+        assert result.status == ProcessingStatus.SUCCESS
+        mock_asr_call.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_process_photo_success(
         self,
@@ -545,6 +684,44 @@ class TestMessageProcessor:
 
         assert result.status == ProcessingStatus.SUCCESS
         assert result.response == mock_nlp_response["response"]
+        mock_bot.get_file.assert_awaited_once_with("photo_large")
+
+    @pytest.mark.asyncio
+    async def test_process_photo_skips_oversized_variant(
+        self,
+        mock_photo_message: MagicMock,
+        mock_bot: MagicMock,
+        mock_analyze_response: dict[str, Any],
+        mock_nlp_response: dict[str, Any],
+    ) -> None:
+        """Test the largest variant within MAX_PHOTO_DIMENSION is downloaded."""
+        processor = MessageProcessor()
+        mock_photo_message.photo.append(
+            MagicMock(file_id="photo_huge", width=2560, height=1920)
+        )
+        mock_bot.download_file = AsyncMock(
+            return_value=io.BytesIO(b"fake image content")
+        )
+
+        with (
+            patch.object(
+                processor._client,
+                "call_analyze_service",
+                new_callable=AsyncMock,
+                return_value=mock_analyze_response,
+            ),
+            patch.object(
+                processor._client,
+                "call_nlp_service",
+                new_callable=AsyncMock,
+                return_value=mock_nlp_response,
+            ),
+        ):
+            await processor.process_message(
+                mock_photo_message, InputType.PHOTO, mock_bot
+            )
+
+        mock_bot.get_file.assert_awaited_once_with("photo_large")
 
     @pytest.mark.asyncio
     async def test_process_photo_no_text(
@@ -610,6 +787,9 @@ class TestMessageProcessor:
                 new_callable=AsyncMock,
                 return_value=mock_image_search_response,
             ),
+            patch.object(
+                processor._client, "call_nlp_service", new_callable=AsyncMock
+            ) as mock_nlp,
         ):
             result = await processor.process_message(
                 mock_photo_message, InputType.PHOTO, mock_bot
@@ -619,6 +799,8 @@ class TestMessageProcessor:
         assert result.raw_response is not None
         assert result.raw_response.get("priority") == "exact_match"
         assert "image_search" in result.raw_response
+        # An exact match answers alone; no NLP turn is sent for the object name
+        mock_nlp.assert_not_called()
 
         # Verify products includes ALL found products (exact + similar)
         assert result.products is not None
@@ -798,7 +980,11 @@ class TestMessageProcessor:
         call_args = mock_nlp.call_args
         assert call_args[0][0] == "keyboard"
         # Priority should indicate text with similar products
+        assert result.raw_response is not None
         assert result.raw_response.get("priority") == "text_with_similar_products"
+        # The NLP response is nested as-is, not copied or mutated
+        assert result.raw_response["nlp"] is mock_nlp_response
+        assert "priority" not in mock_nlp_response
 
     @pytest.mark.asyncio
     async def test_process_photo_document_priority(
@@ -840,6 +1026,43 @@ class TestMessageProcessor:
         assert result.raw_response is not None
         assert result.raw_response.get("priority") == "document_ocr"
 
+    @pytest.mark.asyncio
+    async def test_process_photo_document_skips_image_search(
+        self,
+        mock_photo_message: MagicMock,
+        mock_bot: MagicMock,
+    ) -> None:
+        """Test documents without text do not search products by embedding."""
+        processor = MessageProcessor()
+        mock_bot.download_file = AsyncMock(
+            return_value=io.BytesIO(b"fake image content")
+        )
+        analyze_response = {
+            "result": "",
+            "classification": {"predicted_type": "document", "confidence": 0.9},
+            "image_embedding": [0.1] * 1536,
+        }
+
+        with (
+            patch.object(
+                processor._client,
+                "call_analyze_service",
+                new_callable=AsyncMock,
+                return_value=analyze_response,
+            ),
+            patch.object(
+                processor._client,
+                "search_products_by_embedding",
+                new_callable=AsyncMock,
+            ) as mock_search,
+        ):
+            result = await processor.process_message(
+                mock_photo_message, InputType.PHOTO, mock_bot
+            )
+
+        mock_search.assert_not_called()
+        assert result.status == ProcessingStatus.SUCCESS
+
     @pytest.mark.asyncio
     async def test_process_unsupported_type(
         self,
@@ -871,6 +1094,17 @@ class TestMessageProcessor:
         assert result.status == ProcessingStatus.SUCCESS
         assert result.response == ""
 
+    def test_try_fast_path(self) -> None:
+        """Test commands resolve synchronously and other types do not."""
+        processor = MessageProcessor()
+
+        result = processor.try_fast_path(InputType.COMMAND)
+
+        assert result is not None
+        assert result.status == ProcessingStatus.SUCCESS
+        assert result.response == ""
+        assert processor.try_fast_path(InputType.TEXT) is None
+
     @pytest.mark.asyncio
     async def test_process_text_directly(
         self,
@@ -918,6 +1152,108 @@ class TestMessageProcessor:
 
         assert result.status == ProcessingStatus.SUCCESS
 
+    @pytest.mark.asyncio
+    async def test_process_text_repeats_always_reach_nlp(
+        self,
+        mock_nlp_response: dict[str, Any],
+    ) -> None:
+        """Test sequential repeats are sent to the conversational NLP service."""
+        processor = MessageProcessor()
+
+        with patch.object(
+            processor._client,
+            "call_nlp_service",
+            new_callable=AsyncMock,
+            return_value=mock_nlp_response,
+        ) as mock_nlp_call:
+            await processor.process_text("sí", conversation_id="1")
+            await processor.process_text("sí", conversation_id="1")
+
+        assert mock_nlp_call.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_process_text_concurrent_duplicates_share_one_call(
+        self,
+        mock_nlp_response: dict[str, Any],
+    ) -> None:
+        """Test identical concurrent requests are served by a single NLP call."""
+        processor = MessageProcessor()
+
+        async def slow_nlp(*_: Any, **__: Any) -> dict[str, Any]:
+            await asyncio.sleep(0.01)
+            return mock_nlp_response
+
+        with patch.object(
+            processor._client,
+            "call_nlp_service",
+            new_callable=AsyncMock,
+            side_effect=slow_nlp,
+        ) as mock_nlp_call:
+            results = await asyncio.gather(
+                *[
+                    processor.process_text("Hello", conversation_id="1")
+                    for _ in range(3)
+                ]
+            )
+
+        assert all(r.response == mock_nlp_response["response"] for r in results)
+        assert mock_nlp_call.await_count == 1
+        assert processor._nlp_inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_process_text_concurrent_senders_not_merged(
+        self,
+        mock_nlp_response: dict[str, Any],
+    ) -> None:
+        """Test two users of one group chat sending the same text get own calls."""
+        processor = MessageProcessor()
+
+        async def slow_nlp(*_: Any, **__: Any) -> dict[str, Any]:
+            await asyncio.sleep(0.01)
+            return mock_nlp_response
+
+        with patch.object(
+            processor._client,
+            "call_nlp_service",
+            new_callable=AsyncMock,
+            side_effect=slow_nlp,
+        ) as mock_nlp_call:
+            await asyncio.gather(
+                processor.process_text(
+                    "Hola", conversation_id="-100", user_info={"external_id": "1"}
+                ),
+                processor.process_text(
+                    "Hola", conversation_id="-100", user_info={"external_id": "2"}
+                ),
+            )
+
+        assert mock_nlp_call.await_count == 2
+        senders = [
+            c.kwargs["user_info"]["external_id"] for c in mock_nlp_call.call_args_list
+        ]
+        assert sorted(senders) == ["1", "2"]
+
+    @pytest.mark.asyncio
+    async def test_process_text_concurrent_variants_not_merged(
+        self,
+        mock_nlp_response: dict[str, Any],
+    ) -> None:
+        """Test only exact duplicates share a call, not case or punctuation variants."""
+        processor = MessageProcessor()
+
+        with patch.object(
+            processor._client,
+            "call_nlp_service",
+            new_callable=AsyncMock,
+            return_value=mock_nlp_response,
+        ) as mock_nlp_call:
+            await asyncio.gather(
+                processor.process_text("Hola", conversation_id="1"),
+                processor.process_text("¿hola?", conversation_id="1"),
+            )
+
+        assert mock_nlp_call.await_count == 2
+
 
 class TestProcessingStatus:
     """Tests for ProcessingStatus enum."""
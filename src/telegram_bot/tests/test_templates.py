@@ -11,6 +11,7 @@ import pytest
 from telegram_bot.templates import (
     COMMAND_MESSAGES,
     DEFAULT_ERROR,
+    DOCUMENT_PROMPTS,
     ERROR_MESSAGES,
     PRODUCT_MESSAGES,
     TemplateManager,
@@ -84,6 +85,15 @@ class TestLanguageNormalization:
         assert templates._normalize_language("EN") == "en"
         assert templates._normalize_language("ES-mx") == "es"
 
+    def test_normalize_is_memoized(self) -> None:
+        """Test that repeated codes are served from the normalization cache."""
+        from telegram_bot.templates import _normalize_language_code
+
+        templates._normalize_language("pt-PT")
+        hits = _normalize_language_code.cache_info().hits
+        assert templates._normalize_language("pt-PT") == "pt"
+        assert _normalize_language_code.cache_info().hits == hits + 1
+
 
 # =============================================================================
 # Error message tests
@@ -317,6 +327,16 @@ class TestNLPPrompts:
         # Template should preserve the text inside triple quotes
         assert 'Text with "quotes"' in prompt
 
+    def test_render_document_prompt_localized(self) -> None:
+        """Test document prompt follows the user's language."""
+        prompt = templates.render_document_prompt("Factura {1}", "es-MX")
+        assert "Factura {1}" in prompt
+        assert prompt.startswith("El usuario ha enviado una imagen")
+
+    def test_all_languages_have_document_prompt(self) -> None:
+        """Test every supported language has a document prompt."""
+        assert set(DOCUMENT_PROMPTS) == templates.SUPPORTED_LANGUAGES
+
 
 # =============================================================================
 # Custom filter tests